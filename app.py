@@ -1,8 +1,15 @@
+import os
+import sqlite3
+import threading
+import time
 import streamlit as st
-import requests
+import diskcache
+import orjson
+import httpx
+import numpy as np
 import pandas as pd
-import plotly.express as px
-from datetime import datetime, timedelta
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
 
 # ---------------------------
 # Page config
@@ -50,6 +57,11 @@ ANIMATED_CSS = """
 .metric-title {font-size: 16px; margin: 0; opacity: 0.9}
 .metric-value {font-size: 28px; font-weight: 700; margin: 4px 0 0}
 
+/********************
+  Card grid (wraps on narrow screens)
+*********************/
+.cards {display: grid; grid-template-columns: repeat(auto-fit, minmax(160px, 1fr)); gap: 12px; margin: 12px 0}
+
 /********************
   Nice header band
 *********************/
@@ -102,71 +114,182 @@ WMO_MAP = {
     95: "storm", 96: "storm", 99: "storm",
 }
 
+# WMO codes are bounded to 0-99, so lookups index a flat table
+WMO_TABLE = tuple(WMO_MAP.get(i, "cloudy") for i in range(100))
+
+# Alert thresholds per reading, highest level first; only the first crossed level fires
+ALERT_RULES = (
+    ("heat", ((40, "🔥 Severe Heat Alert: Stay hydrated, avoid peak sun."),
+              (35, "🥵 Heat Caution: Wear light clothing and drink water."))),
+    ("wind", ((75, "🌬️ Gale Warning: Secure loose items, avoid high places."),
+              (50, "💨 High Wind: Be cautious outdoors."))),
+    ("rain", ((70, "🌧️ High chance of rain in next 6 hours. Carry an umbrella."),)),
+    ("uv",   ((8,  "☀️ Extreme UV today. Use SPF 30+, hat & sunglasses."),)),
+)
+
+# Theme CSS (colour vars + animated styles) built once per condition
+RENDERED_THEMES = {
+    key: f"<style>:root{{--c1:{t['c1']};--c2:{t['c2']};--c3:{t['c3']};}}</style>" + ANIMATED_CSS
+    for key, t in CONDITION_THEMES.items()
+}
+
+# WMO code -> (theme, theme CSS) in one indexed lookup
+WMO_TO_THEME = tuple((CONDITION_THEMES[key], RENDERED_THEMES[key]) for key in WMO_TABLE)
+DEFAULT_THEME = (CONDITION_THEMES["cloudy"], RENDERED_THEMES["cloudy"])
+
+# Open-Meteo timestamps are ISO-8601 without seconds (e.g. 2024-05-01T14:00)
+OPEN_METEO_TIME_FMT = "%Y-%m-%dT%H:%M"
+
+# Quick-pick cities: coordinates embedded so the common case skips geocoding
+KNOWN_CITIES = {
+    "Delhi":     (28.6139, 77.2090),
+    "Mumbai":    (19.0760, 72.8777),
+    "Bengaluru": (12.9716, 77.5946),
+    "Chennai":   (13.0827, 80.2707),
+}
+
+# Shared HTTP/2 client: reused across reruns so Open-Meteo calls keep the
+# TCP/TLS connection alive instead of handshaking on every interaction
+@st.cache_resource
+def get_client():
+    return httpx.Client(
+        http2=True,
+        timeout=20,
+        limits=httpx.Limits(max_connections=8, max_keepalive_connections=4),
+    )
+
+CACHE_DIR = os.path.expanduser("~/.cache/weather-dash")
+GEO_DB_PATH = os.path.expanduser("~/.cache/weather-dash-geo.db")
+
+# On-disk response cache shared by all Streamlit workers and restarts
+@st.cache_resource
+def get_disk_cache():
+    return diskcache.Cache(CACHE_DIR)
+
+# Persistent city -> coordinates table; geocodes never go stale.
+# The connection is shared by all sessions, so every use goes through the lock
+@st.cache_resource
+def get_geo_db():
+    os.makedirs(os.path.dirname(GEO_DB_PATH), exist_ok=True)
+    db = sqlite3.connect(GEO_DB_PATH, check_same_thread=False)
+    db.execute(
+        "CREATE TABLE IF NOT EXISTS geo(query TEXT PRIMARY KEY, latitude REAL, longitude REAL, name TEXT, country TEXT)"
+    )
+    return db, threading.Lock()
+
 @st.cache_data(ttl=1800)
 def geocode_city(city_name: str):
+    known = city_name.strip().title()
+    if known in KNOWN_CITIES:
+        lat, lon = KNOWN_CITIES[known]
+        return {"latitude": lat, "longitude": lon, "name": known, "country": "India"}
+
+    db, db_lock = get_geo_db()
+    key = city_name.strip().lower()
+    with db_lock:
+        row = db.execute("SELECT latitude, longitude, name, country FROM geo WHERE query = ?", (key,)).fetchone()
+    if row:
+        return dict(zip(("latitude", "longitude", "name", "country"), row))
+
     url = f"https://geocoding-api.open-meteo.com/v1/search?name={city_name}&count=1&language=en&format=json"
-    r = requests.get(url, timeout=20)
+    r = get_client().get(url)
     if r.status_code == 200:
-        js = r.json()
+        js = orjson.loads(r.content)
         if js.get("results"):
             res = js["results"][0]
-            return {
+            geo = {
                 "latitude": res["latitude"],
                 "longitude": res["longitude"],
                 "name": res["name"],
                 "country": res.get("country", ""),
             }
+            with db_lock, db:
+                db.execute(
+                    "INSERT OR REPLACE INTO geo(query, latitude, longitude, name, country) VALUES (?, ?, ?, ?, ?)",
+                    (key, geo["latitude"], geo["longitude"], geo["name"], geo["country"]),
+                )
+            return geo
     return None
 
 @st.cache_data(ttl=300)
 def fetch_weather(lat: float, lon: float):
-    # Hourly + Daily with useful fields
+    # Keyed on 5-minute buckets so entries go stale with the in-process TTL
+    disk = get_disk_cache()
+    key = f"{lat:.3f},{lon:.3f},{int(time.time() // 300)}"
+    cached = disk.get(key)
+    if cached is not None:
+        return cached
+
+    # Hourly + Daily: only the fields the dashboard renders
     url = (
         "https://api.open-meteo.com/v1/forecast?"
         f"latitude={lat}&longitude={lon}"
         "&current_weather=true"
         "&hourly=temperature_2m,apparent_temperature,relativehumidity_2m,windspeed_10m,precipitation_probability"
-        "&daily=weathercode,temperature_2m_max,temperature_2m_min,apparent_temperature_max,apparent_temperature_min,"
-        "sunrise,sunset,uv_index_max,precipitation_sum,windspeed_10m_max,windgusts_10m_max"
+        "&daily=temperature_2m_max,temperature_2m_min,apparent_temperature_max,sunrise,sunset,uv_index_max"
         "&timezone=auto"
     )
-    r = requests.get(url, timeout=20)
+    r = get_client().get(url)
     r.raise_for_status()
-    return r.json()
+    js = orjson.loads(r.content)
+    disk.set(key, js, expire=1800)
+    return js
 
 
-def set_theme_from_code(wmo_code: int):
-    key = WMO_MAP.get(wmo_code, "cloudy")
-    theme = CONDITION_THEMES[key]
-    css_vars = f"<style>:root{{--c1:{theme['c1']};--c2:{theme['c2']};--c3:{theme['c3']};}}</style>"
-    st.markdown(css_vars + ANIMATED_CSS, unsafe_allow_html=True)
-    return theme
+# Theme and its prebuilt CSS for a WMO code
+def theme_from_code(wmo_code: int):
+    return WMO_TO_THEME[wmo_code] if 0 <= wmo_code < 100 else DEFAULT_THEME
 
-# Render a glass metric card
-def glass_metric(title: str, value: str):
-    st.markdown(
-        f"""
-        <div class="glass">
-            <p class="metric-title">{title}</p>
-            <p class="metric-value">{value}</p>
-        </div>
-        """,
-        unsafe_allow_html=True,
+# Geocode + forecast + parsing for a city: hourly data as column arrays
+# (DataFrames are only built for the table), daily as a DataFrame
+@st.cache_data(ttl=300)
+def get_city_bundle(city_name: str):
+    geo = geocode_city(city_name)
+    if not geo:
+        return None
+
+    data = fetch_weather(geo["latitude"], geo["longitude"])
+    current = data.get("current_weather", {})
+
+    hourly_cols = data.get("hourly", {})
+    hourly = {"time": np.array(hourly_cols.get("time", []), dtype="datetime64[m]")}
+    hourly.update({col: pd.to_numeric(vals) for col, vals in hourly_cols.items() if col != "time"})
+    # Table labels formatted once per fetch, then sliced per window
+    hourly["time_label"] = pd.DatetimeIndex(hourly["time"]).strftime("%d %b • %I:%M %p").to_numpy()
+
+    daily = pd.DataFrame(data.get("daily", {}))
+    for col in ("sunrise", "sunset"):
+        if col in daily.columns:
+            daily[col] = pd.to_datetime(daily[col], format=OPEN_METEO_TIME_FMT)
+
+    return geo, current, hourly, daily
+
+# Pretty chart trace names, keyed by Open-Meteo column
+PLOT_LABELS = {
+    "temperature_2m": "Air Temperature (°C)",
+    "apparent_temperature": "Feels Like (°C)",
+    "precipitation_probability": "Precipitation Probability (%)",
+    "windspeed_10m": "Wind Speed (km/h)",
+}
+
+# Detail table headers, keyed by hourly column
+TABLE_COLUMNS = {
+    "time_label": "Time", "temperature_2m": "Temp (°C)", "apparent_temperature": "Feels (°C)",
+    "relativehumidity_2m": "Humidity (%)", "precipitation_probability": "Rain %", "windspeed_10m": "Wind (km/h)",
+}
+
+# Glass metric card markup
+def card_html(title: str, value: str):
+    return (
+        f'<div class="glass"><p class="metric-title">{title}</p>'
+        f'<p class="metric-value">{value}</p></div>'
     )
 
-# Render header band
-def header_band(emoji: str, title: str, subtitle: str):
-    st.markdown(
-        f"""
-        <div class="glass header">
-            <div class="emoji">{emoji}</div>
-            <div>
-                <div class="title">{title}</div>
-                <div class="subtitle">{subtitle}</div>
-            </div>
-        </div>
-        """,
-        unsafe_allow_html=True,
+# Header band markup
+def header_html(emoji: str, title: str, subtitle: str):
+    return (
+        f'<div class="glass header"><div class="emoji">{emoji}</div>'
+        f'<div><div class="title">{title}</div><div class="subtitle">{subtitle}</div></div></div>'
     )
 
 # ---------------------------
@@ -174,8 +297,6 @@ def header_band(emoji: str, title: str, subtitle: str):
 # ---------------------------
 st.sidebar.title("⚙️ Controls")
 city = st.sidebar.text_input("Enter City (India)", value="Chennai")
-hours_ahead = st.sidebar.slider("Forecast Horizon (hours)", min_value=6, max_value=48, value=24, step=6)
-show_table = st.sidebar.checkbox("Show Detailed Table", value=True)
 
 # Useful quick-picks
 with st.sidebar.expander("Quick Picks"):
@@ -194,59 +315,55 @@ if not city:
 # ---------------------------
 # Fetch: Geocode -> Weather
 # ---------------------------
-geo = geocode_city(city)
-if not geo:
-    st.error("❌ City not found. Please try another name.")
-    st.stop()
-
+# Network + parsing are cached per city, so slider/checkbox reruns only slice
 try:
-    data = fetch_weather(geo["latitude"], geo["longitude"])
+    bundle = get_city_bundle(city)
 except Exception as e:
     st.error(f"❌ Failed to fetch weather data: {e}")
     st.stop()
 
-current = data.get("current_weather", {})
+if bundle is None:
+    st.error("❌ City not found. Please try another name.")
+    st.stop()
 
-# Theme + header
-theme = set_theme_from_code(int(current.get("weathercode", 1)))
-local_time = pd.to_datetime(current.get("time")).strftime("%a, %d %b %Y • %I:%M %p")
-header_band(
-    theme["emoji"],
-    f"{geo['name']}, {geo['country']} — {theme['name']}",
-    f"Last updated: {local_time}",
-)
+geo, current, hourly, daily = bundle
+times = hourly["time"]  # already in local timezone
 
 # ---------------------------
-# Current Conditions (Cards)
+# Upcoming hours (first entry = current hour)
 # ---------------------------
-col1, col2, col3, col4 = st.columns(4)
-with col1:
-    glass_metric("Temperature", f"{current.get('temperature','–')} °C")
-with col2:
-    glass_metric("Feels Like", "–")  # will fill from hourly below
-with col3:
-    glass_metric("Wind Speed", f"{current.get('windspeed','–')} km/h")
-with col4:
-    glass_metric("Wind Direction", f"{current.get('winddirection','–')}°")
+# Cards, messages and alerts only look at the next few hours, which every
+# horizon (min 6h) covers; the horizon itself only matters to the fragment below
+now = np.datetime64(current["time"], "m") if current.get("time") else (times[0] if times.size else None)
+lo = int(times.searchsorted(now)) if times.size else 0
+hr_empty = lo >= times.size
+apparent_arr = hourly["apparent_temperature"][lo:] if "apparent_temperature" in hourly else None
+rain_arr = hourly["precipitation_probability"][lo:] if "precipitation_probability" in hourly else None
 
 # ---------------------------
-# Prepare Hourly / Daily DataFrames
+# Theme + Header + Current Conditions (one HTML block)
 # ---------------------------
-hourly = pd.DataFrame(data.get("hourly", {}))
-daily = pd.DataFrame(data.get("daily", {}))
-
-if not hourly.empty:
-    hourly["time"] = pd.to_datetime(hourly["time"])  # already in local timezone
-    now = pd.to_datetime(current["time"]) if current.get("time") else hourly["time"].iloc[0]
-    mask = (hourly["time"] >= now) & (hourly["time"] < now + timedelta(hours=hours_ahead))
-    hr = hourly.loc[mask].copy()
-
-    # Fill Feels Like in card if available
-    if "apparent_temperature" in hourly.columns and not hr.empty:
-        feels_now = hr.iloc[0]["apparent_temperature"]
-        with col2:
-            glass_metric("Feels Like", f"{feels_now:.1f} °C")
-
+theme, theme_css = theme_from_code(int(current.get("weathercode", 1)))
+local_time = pd.to_datetime(current.get("time"), format=OPEN_METEO_TIME_FMT).strftime("%a, %d %b %Y • %I:%M %p")
+feels_now = f"{apparent_arr[0]:.1f} °C" if apparent_arr is not None and not hr_empty else "–"
+cards = [
+    ("Temperature", f"{current.get('temperature','–')} °C"),
+    ("Feels Like", feels_now),
+    ("Wind Speed", f"{current.get('windspeed','–')} km/h"),
+    ("Wind Direction", f"{current.get('winddirection','–')}°"),
+]
+html_parts = [
+    theme_css,
+    header_html(
+        theme["emoji"],
+        f"{geo['name']}, {geo['country']} — {theme['name']}",
+        f"Last updated: {local_time}",
+    ),
+    '<div class="cards">' + "".join(card_html(t, v) for t, v in cards) + "</div>",
+]
+st.markdown("\n".join(html_parts), unsafe_allow_html=True)
+
+if times.size:
  # --- Friendly Weather Messages ---
     def weather_message(temp, wind, rain_prob):
         if temp > 38:
@@ -270,7 +387,7 @@ if not hourly.empty:
 
         return "🌈 Weather looks pleasant. Enjoy your day!"
 
-    rain_probability = hr.iloc[0]["precipitation_probability"] if "precipitation_probability" in hr else 0
+    rain_probability = rain_arr[0] if rain_arr is not None and not hr_empty else 0
     friendly_message = weather_message(
         current['temperature'],
         current['windspeed'],
@@ -282,97 +399,60 @@ if not hourly.empty:
 # Alerts (Heat / Wind / Rain / UV)
 # ---------------------------
 alerts = []
-if not hr.empty:
-    t_now = float(hr.iloc[0]["apparent_temperature"]) if "apparent_temperature" in hr else float(current.get("temperature", 0))
-    if t_now >= 40:
-        alerts.append("🔥 Severe Heat Alert: Stay hydrated, avoid peak sun.")
-    elif t_now >= 35:
-        alerts.append("🥵 Heat Caution: Wear light clothing and drink water.")
-
-    ws_now = float(current.get("windspeed", 0))
-    if ws_now >= 75:
-        alerts.append("🌬️ Gale Warning: Secure loose items, avoid high places.")
-    elif ws_now >= 50:
-        alerts.append("💨 High Wind: Be cautious outdoors.")
-
-    rain_next6 = hr.head(6)["precipitation_probability"].max() if "precipitation_probability" in hr else 0
-    if rain_next6 >= 70:
-        alerts.append("🌧️ High chance of rain in next 6 hours. Carry an umbrella.")
-
+if not hr_empty:
+    # Max over the next 6 hours, skipping missing (null) hours like pandas does
+    rain_window = rain_arr[:6] if rain_arr is not None else np.empty(0)
+    rain_next6 = float(np.nanmax(rain_window)) if np.isfinite(rain_window).any() else 0.0
+    readings = {
+        "heat": float(apparent_arr[0]) if apparent_arr is not None else float(current.get("temperature", 0)),
+        "wind": float(current.get("windspeed", 0)),
+        "rain": rain_next6,
+    }
     # UV index from today's daily
     if not daily.empty and "uv_index_max" in daily.columns:
-        uv_today = float(daily.iloc[0]["uv_index_max"])
-        if uv_today >= 8:
-            alerts.append("☀️ Extreme UV today. Use SPF 30+, hat & sunglasses.")
+        readings["uv"] = float(daily.iloc[0]["uv_index_max"])
+
+    for metric, levels in ALERT_RULES:
+        value = readings.get(metric)
+        if value is None:
+            continue
+        for threshold, message in levels:
+            if value >= threshold:
+                alerts.append(message)
+                break
 
 if alerts:
     for a in alerts:
         st.warning(a)
 
-# ---------------------------
-# Charts: Temperature (air vs feels), Precip %, Wind speed
-# ---------------------------
-if not hr.empty:
-    # Pretty labels
-    hr_plot = hr.rename(columns={
-        "temperature_2m": "Air Temperature (°C)",
-        "apparent_temperature": "Feels Like (°C)",
-        "precipitation_probability": "Precipitation Probability (%)",
-        "windspeed_10m": "Wind Speed (km/h)",
-    })
-
-    st.subheader("📈 Hourly Forecast")
-
-    # Temperature chart
-    temp_cols = [c for c in ["Air Temperature (°C)", "Feels Like (°C)"] if c in hr_plot.columns]
-    if temp_cols:
-        fig_t = px.line(hr_plot, x="time", y=temp_cols, markers=True)
-        fig_t.update_layout(title="Temperature (Next Hours)", xaxis_title="Time", yaxis_title="°C", legend_title="")
-        st.plotly_chart(fig_t, use_container_width=True)
-
-    # Precipitation probability
-    if "Precipitation Probability (%)" in hr_plot.columns:
-        fig_p = px.bar(hr_plot, x="time", y="Precipitation Probability (%)")
-        fig_p.update_layout(title="Precipitation Probability", xaxis_title="Time", yaxis_title="%")
-        st.plotly_chart(fig_p, use_container_width=True)
-
-    # Wind speed
-    if "Wind Speed (km/h)" in hr_plot.columns:
-        fig_w = px.line(hr_plot, x="time", y="Wind Speed (km/h)", markers=True)
-        fig_w.update_layout(title="Wind Speed", xaxis_title="Time", yaxis_title="km/h")
-        st.plotly_chart(fig_w, use_container_width=True)
-
 # ---------------------------
 # Today Snapshot (Sunrise/Sunset & High/Low)
 # ---------------------------
 if not daily.empty:
     st.subheader("🗓️ Today at a Glance")
-    c1, c2, c3, c4, c5, c6 = st.columns(6)
 
     def fmt_time(x):
-        try:
-            return pd.to_datetime(x).strftime("%I:%M %p")
-        except:
-            return "–"
-
-    with c1:
-        glass_metric("High", f"{daily.iloc[0]['temperature_2m_max']:.1f} °C")
-    with c2:
-        glass_metric("Low", f"{daily.iloc[0]['temperature_2m_min']:.1f} °C")
-    with c3:
-        glass_metric("Feels Max", f"{daily.iloc[0]['apparent_temperature_max']:.1f} °C")
-    with c4:
-        glass_metric("Sunrise", fmt_time(daily.iloc[0]['sunrise']))
-    with c5:
-        glass_metric("Sunset", fmt_time(daily.iloc[0]['sunset']))
-    with c6:
-        glass_metric("UV Index Max", f"{daily.iloc[0]['uv_index_max']:.0f}")
+        return x.strftime("%I:%M %p") if pd.notna(x) else "–"
+
+    today = daily.iloc[0]
+    day_cards = [
+        ("High", f"{today['temperature_2m_max']:.1f} °C"),
+        ("Low", f"{today['temperature_2m_min']:.1f} °C"),
+        ("Feels Max", f"{today['apparent_temperature_max']:.1f} °C"),
+        ("Sunrise", fmt_time(today['sunrise'])),
+        ("Sunset", fmt_time(today['sunset'])),
+        ("UV Index Max", f"{today['uv_index_max']:.0f}"),
+    ]
+    st.markdown(
+        '<div class="cards">' + "".join(card_html(t, v) for t, v in day_cards) + "</div>",
+        unsafe_allow_html=True,
+    )
 
 # ---------------------------
 # Precipitation progress (next hour)
 # ---------------------------
-if not hr.empty and "precipitation_probability" in hr:
-    next_prob = int(hr.iloc[0]["precipitation_probability"]) if pd.notna(hr.iloc[0]["precipitation_probability"]) else 0
+if not hr_empty and rain_arr is not None:
+    next_prob = int(rain_arr[0]) if pd.notna(rain_arr[0]) else 0
     st.markdown("#### ☔ Chance of Rain (next hour)")
     st.markdown(
         f"""
@@ -385,19 +465,61 @@ if not hr.empty and "precipitation_probability" in hr:
     )
 
 # ---------------------------
-# Details Table
+# Hourly Forecast (fragment: horizon/table controls rerun only this block)
 # ---------------------------
-if show_table and not hr.empty:
-    table = hr[[c for c in [
-        "time", "temperature_2m", "apparent_temperature", "relativehumidity_2m",
-        "precipitation_probability", "windspeed_10m"
-    ] if c in hr.columns]].copy()
-    table.columns = [
-        "Time", "Temp (°C)", "Feels (°C)", "Humidity (%)", "Rain %", "Wind (km/h)"
-    ]
-    table["Time"] = table["Time"].dt.strftime("%d %b • %I:%M %p")
-    st.markdown("#### 🔎 Detailed Hourly Table")
-    st.dataframe(table, use_container_width=True, hide_index=True)
+@st.fragment
+def render_forecast(hourly: dict, lo: int, now):
+    st.subheader("📈 Hourly Forecast")
+    col_h, col_t = st.columns([3, 1])
+    hours_ahead = col_h.slider("Forecast Horizon (hours)", min_value=6, max_value=48, value=24, step=6)
+    show_table = col_t.checkbox("Show Detailed Table", value=True)
+
+    # Times are sorted, so the forecast window is a positional slice
+    hi = int(hourly["time"].searchsorted(now + np.timedelta64(hours_ahead, "h")))
+    if hi <= lo:
+        return
+    hr = {col: arr[lo:hi] for col, arr in hourly.items()}
+
+    # ---------------------------
+    # Charts: Temperature (air vs feels), Precip %, Wind speed
+    # ---------------------------
+    # One figure, three stacked panels sharing the time axis
+    fig = make_subplots(
+        rows=3, cols=1, shared_xaxes=True, vertical_spacing=0.08,
+        subplot_titles=("Temperature (Next Hours)", "Precipitation Probability", "Wind Speed"),
+    )
+    x = hr["time"]
+
+    # Temperature: air vs feels like
+    for col in ("temperature_2m", "apparent_temperature"):
+        if col in hr:
+            fig.add_trace(go.Scattergl(x=x, y=hr[col], mode="lines+markers", name=PLOT_LABELS[col]), row=1, col=1)
+
+    # Precipitation probability
+    if "precipitation_probability" in hr:
+        fig.add_trace(go.Bar(x=x, y=hr["precipitation_probability"], name=PLOT_LABELS["precipitation_probability"]), row=2, col=1)
+
+    # Wind speed
+    if "windspeed_10m" in hr:
+        fig.add_trace(go.Scattergl(x=x, y=hr["windspeed_10m"], mode="lines+markers", name=PLOT_LABELS["windspeed_10m"]), row=3, col=1)
+
+    fig.update_yaxes(title_text="°C", row=1, col=1)
+    fig.update_yaxes(title_text="%", row=2, col=1)
+    fig.update_yaxes(title_text="km/h", row=3, col=1)
+    fig.update_xaxes(title_text="Time", row=3, col=1)
+    fig.update_layout(height=900, legend_title="")
+    st.plotly_chart(fig, use_container_width=True)
+
+    # ---------------------------
+    # Details Table
+    # ---------------------------
+    if show_table:
+        table = pd.DataFrame({label: hr[c] for c, label in TABLE_COLUMNS.items() if c in hr})
+        st.markdown("#### 🔎 Detailed Hourly Table")
+        st.dataframe(table, use_container_width=True, hide_index=True)
+
+if not hr_empty:
+    render_forecast(hourly, lo, now)
 
 # ---------------------------
 # Footer note